@@ -1,13 +1,16 @@
 """Defines the DocumentLine object, a node in a familial tree describing a structured document
 layout."""
-import ipaddress as ipa
+from __future__ import annotations
 from operator import attrgetter
 import logging
 import re
-from typing import Optional, List, Callable, Iterator, Tuple
+import sys
+from typing import Optional, List, Iterator, Tuple, TYPE_CHECKING
 
-
-IPAddrAndNet = Tuple[ipa.IPv4Address | ipa.IPv6Address, ipa.IPv4Network | ipa.IPv6Network | None]
+if TYPE_CHECKING:
+    import ipaddress as ipa
+    IPAddrAndNet = Tuple[ipa.IPv4Address | ipa.IPv6Address,
+                         ipa.IPv4Network | ipa.IPv6Network | None]
 
 
 class DocumentLine:
@@ -29,6 +32,10 @@ class DocumentLine:
         >>> dl.endswith('The Spanish Inquisition')
         Out[4]: False
 
+    The 'children' attribute is a list of the immediate children of the line. Lines without
+    children share an empty tuple instead, so attach children with add_child(), which creates the
+    list on the first child and sets the child's parent.
+
     Parameters:
         line_num:
             An int indicating the line number of the line in the source document.
@@ -38,22 +45,71 @@ class DocumentLine:
             The DocumentLine object that is the immediate parent of this object. Defaults to None.
             Can be set after object creation.
     """
+    __slots__ = ('_line_num', '_line', '_hash', '_is_comment', '_parent', '_gen', '_ancestors',
+                 '_lineage_epoch_seen', 'children', '_ips_parsed', '_ip_addrs', '_ip_nets')
+
     _ip_patterns = {
-        'ipv6_net': re.compile(r'([0-9A-Fa-f]{0,4}:[0-9A-Fa-f]{0,4}:[0-9A-Fa-f:]*/\d+)'),
-        'ipv6_addr': re.compile(r'([0-9A-Fa-f]{0,4}:[0-9A-Fa-f]{0,4}:[0-9A-Fa-f:]*)'),
+        'ipv6_net': re.compile(r'(?<![0-9A-Fa-f:])'
+                               r'([0-9A-Fa-f]{0,4}:[0-9A-Fa-f]{0,4}:[0-9A-Fa-f:]*/\d{1,3})(?!\d)'),
+        'ipv6_addr': re.compile(r'(?<![0-9A-Fa-f:])'
+                                r'([0-9A-Fa-f]{0,4}:[0-9A-Fa-f]{0,4}:[0-9A-Fa-f:]*)'),
         'snmp_oid': re.compile(r'\d+\.\d+\.\d+\.\d+\.'),
-        'ipv4_cidr': re.compile(r'(?<![\.\-])(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}/\d{1,2})'),
-        'ipv4_addr_netmask': re.compile(r'(?<![\.\-])(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3} '
-                                        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(?![\.\-])'),
-        'ipv4_addr': re.compile(r'(?<![\.\-])(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(?![\.\-])'),
+        'ipv4_cidr': re.compile(r'(?<![\.\-\d])'
+                                r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}/\d{1,2})(?!\d)'),
+        'ipv4_addr_netmask': re.compile(r'(?<![\.\-\d])(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3} '
+                                        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(?![\.\-\d])'),
+        'ipv4_addr': re.compile(r'(?<![\.\-\d])'
+                                r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(?![\.\-\d])'),
     }
-    """Stores compiled re.Pattern objects for use in DocumentLine._gen_ip_addrs_nets()."""
+    """Stores compiled re.Pattern objects for use in DocumentLine._gen_ip_addrs_nets().
+
+    Each IP pattern is bounded by lookarounds, so a match can only begin at the start of a run of
+    address characters. A failed attempt is rejected at the first character rather than retried
+    from every position inside a long hex, colon, or digit run.
+    """
+    _ip_kinds = tuple(k for k in _ip_patterns if k != 'snmp_oid')
+    """Names of the IP patterns in _ip_patterns, in order of matching priority."""
+    #
+    # All IP patterns combined into one alternation with a named group per kind, so a single regex
+    # pass finds the next IP-like term of any kind. At the same position, alternatives are tried in
+    # the priority order of _ip_kinds. The bound search method is stored to skip the attribute
+    # lookup and re.search() wrapper in the scan loop.
+    _ip_search = re.compile('|'.join(f'(?P<{k}>{p.pattern})' for k, p in _ip_patterns.items()
+                                     if k != 'snmp_oid')).search
+    _snmp_oid_search = _ip_patterns['snmp_oid'].search
+    _comment_match = re.compile(r'\s*[!#]').match
+    """Matches a comment line without building an lstrip()'ed copy of the line."""
+    _lineage_epoch = 0
+    """Incremented whenever the parent of any existing DocumentLine is set. Generation levels and
+    ancestors cached at an older epoch are recomputed when next read. See _refresh_lineage()."""
+    _no_children = ()
+    """Shared empty children sequence of lines that have no children. See add_child()."""
+    _no_ips = frozenset()
+    """Shared empty frozenset assigned to ip_addrs and ip_nets of lines with no IPs."""
+    _ipa = None
+    """The ipaddress module, or None until _import_ip_modules() is first called."""
+    _socket = None
+    """The socket module, or None until _import_ip_modules() is first called."""
+    _ip_obj_kinds = None
+    """Maps each ipaddress class accepted by has_ip() to the kind of match it needs, or None until
+    has_ip() is first called."""
 
     def __init__(self, line_num: int, line: str, parent: Optional[object] = None):
         self._line_num = line_num
-        self._line = line
-        self.parent = parent
-        self.children: List[object] = []
+        #
+        # Configs repeat many lines verbatim ("!", " exit", " no shutdown"). Interning lets those
+        # duplicates share one string object. Very long lines are rarely repeated and are left be.
+        self._line = sys.intern(line) if len(line) < 4096 else line
+        self._hash = hash((line_num, line))
+        self._is_comment = None
+        #
+        # The parent is assigned directly rather than through the parent setter. A new line has no
+        # descendants whose cached lineage could go stale, so the lineage epoch is left alone.
+        self._parent = parent
+        self._gen = 1
+        self._ancestors = ()
+        self._lineage_epoch_seen = -1
+        self.children: List[object] | Tuple[()] = self._no_children
         self._ips_parsed = False
         self._ip_addrs = None
         self._ip_nets = None
@@ -70,6 +126,62 @@ class DocumentLine:
         """
         return self._line
 
+    @property
+    def parent(self):
+        """The DocumentLine object that is the immediate parent of this object, or None for a
+        top-level object.
+
+        Setting this attribute marks the cached generation level and ancestors of every
+        DocumentLine as stale. They are recomputed from the parent chain when next read.
+        """
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional[object]):
+        self._parent = parent
+        DocumentLine._lineage_epoch += 1
+
+    def _refresh_lineage(self) -> None:
+        """Recomputes the cached generation level and ancestor tuple from the parent chain if any
+        parent has been set since they were cached.
+
+        The cache is checked against a class-wide epoch rather than pushed down to children when a
+        parent is set, so it stays correct however the tree is assembled, including bottom-up or
+        through direct assignment to children. Each line recomputes at most once per epoch, reusing
+        its parent's refreshed values.
+        """
+        epoch = DocumentLine._lineage_epoch
+        if self._lineage_epoch_seen == epoch:
+            return
+        parent = self._parent
+        if parent is None:
+            self._gen = 1
+            self._ancestors = ()
+        else:
+            # pylint: disable=protected-access
+            parent._refresh_lineage()
+            self._gen = parent._gen + 1
+            self._ancestors = parent._ancestors + (parent,)
+        self._lineage_epoch_seen = epoch
+
+    def add_child(self, child: DocumentLine) -> None:
+        """Appends a DocumentLine to the children of this object and sets this object as its
+        parent.
+
+        Lines without children, the majority in a config, share an empty tuple rather than each
+        holding an empty list. The children list is created when the first child is added through
+        this method.
+
+        Args:
+            child:
+                The DocumentLine to add as the last child of this object.
+        """
+        if self.children:
+            self.children.append(child)
+        else:
+            self.children = [child]
+        child.parent = self
+
     @property
     def ip_addrs(self):
         """A set of ipaddress.IPv[46]Address objects of IPs that were detected in this document
@@ -95,36 +207,82 @@ class DocumentLine:
     @property
     def is_comment(self):
         """True if this line is a comment, e.g. starts with zero or more spaces followed by "!" or
-        "#"."""
-        comment_chars = ['!', '#']
-        return any(self.line.lstrip().startswith(i) for i in comment_chars)
+        "#".
+
+        This property method caches the result on first access."""
+        if self._is_comment is None:
+            self._is_comment = self._comment_match(self._line) is not None
+        return self._is_comment
 
     @property
     def gen(self) -> int:
         """The generation level of the line. 1 indicates a top-level object, 2 indicates a child of
-        a top-level object, 3 is a grandchild, and so on."""
-        if self.parent is None:
-            return 1
-        return self.parent.gen + 1
+        a top-level object, 3 is a grandchild, and so on.
+
+        This value is cached on first access and recomputed only after a parent is set."""
+        self._refresh_lineage()
+        return self._gen
 
     @property
     def ancestors(self) -> List[object]:
         """A list of DocumentLine objects of this object's ancestors, sorted from the top-level to
-        the immediate parent."""
-        if self.parent is None:
-            return []
-        return self.parent.ancestors + [self.parent]
+        the immediate parent.
+
+        The ancestors are cached as a tuple on first access and recomputed only after a parent is
+        set. This property returns a new list built from that tuple."""
+        self._refresh_lineage()
+        return list(self._ancestors)
 
     @property
     def all_descendants(self) -> List[object]:
         """A list of all descendants of this object, ordered in the sequence in which they appear
         in the configuration."""
         descendants = []
-        for child in self.children:
-            descendants.append(child)
-            descendants.extend(child.all_descendants)
+        if self.children:
+            self._extend_descendants(descendants)
         return descendants
 
+    def _extend_descendants(self, out: List[object]) -> None:
+        """Appends all descendants of this object to a list, in the sequence in which they appear in
+        the configuration.
+
+        Walks the tree depth-first with a stack of child iterators rather than recursion, so deep
+        trees cannot hit the recursion limit. Lines without children, the majority in a config, are
+        appended without being pushed onto the stack.
+
+        Args:
+            out:
+                The list to append the descendants to.
+        """
+        append = out.append
+        stack = [iter(self.children)]
+        while stack:
+            for node in stack[-1]:
+                append(node)
+                if node.children:
+                    stack.append(iter(node.children))
+                    break
+            else:
+                stack.pop()
+
+    def iter_descendants(self) -> Iterator[object]:
+        """Iterates over all descendants of this object, in the sequence in which they appear in the
+        configuration.
+
+        Use this instead of all_descendants when iteration may stop early, as descendants after
+        the last one consumed are never visited. all_descendants is faster for a full walk. Walks
+        the tree depth-first with an explicit stack rather than recursion, so deep trees cannot hit
+        the recursion limit.
+
+        Yields:
+            DocumentLine objects descended from this object.
+        """
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
     def re_match(self, pattern: str | re.Pattern, flags: int | re.RegexFlag = 0):
         """Runs a regular expression match on the document line.
 
@@ -211,6 +369,14 @@ class DocumentLine:
             to all descendants, in the same order as they were read by the parser.
         """
         #
+        # Fast path for the default arguments: descendants are appended straight onto the family.
+        if include_ancestors and include_self and include_children and include_all_descendants:
+            self._refresh_lineage()
+            family = [*self._ancestors, self]
+            if self.children:
+                self._extend_descendants(family)
+            return family
+        #
         # If immediate children are not to be included, do not include all descendants.
         if not include_children:
             include_all_descendants = False
@@ -221,13 +387,14 @@ class DocumentLine:
         #
         family = []
         if include_ancestors:
-            family.extend(self.ancestors)
+            self._refresh_lineage()
+            family.extend(self._ancestors)
         if include_self:
             family.append(self)
         if include_children and not include_all_descendants:
             family.extend(self.children)
-        elif include_children and include_all_descendants:
-            family.extend(self.all_descendants)  # All? NO! ALL!
+        elif include_children and include_all_descendants and self.children:
+            self._extend_descendants(family)  # All? NO! ALL!
         return family
 
     def has_ip(self,
@@ -248,25 +415,69 @@ class DocumentLine:
             ValueError:
                 Raised if ip_obj is not a suitable object from the ipaddress library.
         """
-        ip_match = False
-        match type(ip_obj):
-            case ipa.IPv4Address | ipa.IPv6Address:
-                ip_match = ip_obj in self.ip_addrs
-            case ipa.IPv4Network | ipa.IPv6Network:
-                ip_match = ip_obj in self.ip_nets
-            case ipa.IPv4Interface | ipa.IPv6Interface:
-                ip_match = ip_obj.ip in self.ip_addrs and ip_obj.network in self.ip_nets
-            case _:
+        kind = (DocumentLine._ip_obj_kinds or DocumentLine._build_ip_obj_kinds()).get(type(ip_obj))
+        if kind is None:
+            #
+            # Only subclasses of the ipaddress classes miss the table. IPv[46]Interface subclasses
+            # IPv[46]Address, so it must be tested first.
+            ipa = DocumentLine._ipa
+            if isinstance(ip_obj, (ipa.IPv4Interface, ipa.IPv6Interface)):
+                kind = 'interface'
+            elif isinstance(ip_obj, (ipa.IPv4Address, ipa.IPv6Address)):
+                kind = 'address'
+            elif isinstance(ip_obj, (ipa.IPv4Network, ipa.IPv6Network)):
+                kind = 'network'
+            else:
                 raise ValueError(f'ip_obj is a {type(ip_obj)} and not an ipaddress.IPv[46]Address, '
                                  'Network, or Interface')
-        return ip_match
+        if not self._ips_parsed:
+            self._create_ip_sets()
+        if kind == 'address':
+            return ip_obj in self._ip_addrs
+        if kind == 'network':
+            return ip_obj in self._ip_nets
+        return ip_obj.ip in self._ip_addrs and ip_obj.network in self._ip_nets
+
+    @staticmethod
+    def _build_ip_obj_kinds() -> dict:
+        """Builds DocumentLine._ip_obj_kinds on the first call to has_ip() and returns it."""
+        ipa = DocumentLine._ipa or DocumentLine._import_ip_modules()
+        DocumentLine._ip_obj_kinds = {
+            ipa.IPv4Address: 'address',
+            ipa.IPv6Address: 'address',
+            ipa.IPv4Network: 'network',
+            ipa.IPv6Network: 'network',
+            ipa.IPv4Interface: 'interface',
+            ipa.IPv6Interface: 'interface',
+        }
+        return DocumentLine._ip_obj_kinds
+
+    @staticmethod
+    def _import_ip_modules():
+        """Imports ipaddress and socket on first use and stores them as class attributes. Returns
+        the ipaddress module.
+
+        Callers using DocumentLine only for structure and text never load either module. Later
+        calls read the class attributes instead of running an import statement.
+        """
+        # pylint: disable=import-outside-toplevel
+        import ipaddress
+        import socket
+        DocumentLine._socket = socket
+        DocumentLine._ipa = ipaddress
+        return ipaddress
 
     def _create_ip_sets(self) -> None:
         """Creates the IP sets self.ip_addrs and self.ip_nets. Called by the accessor properties on
         first request."""
-        addrs_nets = list(self._gen_ip_addrs_nets())
-        self._ip_addrs = frozenset({a for a, _ in addrs_nets})
-        self._ip_nets  = frozenset({n for _, n in addrs_nets if n is not None})
+        addrs = set()
+        nets = set()
+        for addr, net in self._gen_ip_addrs_nets():
+            addrs.add(addr)
+            if net is not None:
+                nets.add(net)
+        self._ip_addrs = frozenset(addrs) if addrs else self._no_ips
+        self._ip_nets = frozenset(nets) if nets else self._no_ips
         self._ips_parsed = True
 
     def _gen_ip_addrs_nets(self) -> Iterator[IPAddrAndNet]:
@@ -282,118 +493,135 @@ class DocumentLine:
             IPv[46]Network object or None if only an address was detected.
         """
         line = self.line
-        def try_search_and_parse(pattern: re.Pattern,
-                                 convert_fn: Callable[[str], Optional[IPAddrAndNet]],
-                                 match_group: int = 1,
-                                 match_transform: Callable[[str], str] = lambda x: x) \
-                -> Optional[IPAddrAndNet]:
-            """Attempts to parse an IP in the line that this object represents.
-
-            Args:
-                pattern:
-                    Regular expression to match the IP address text.
-                convert_fn:
-                    The private function to be used to convert the string to an ipaddress object.
-                    Use self._add_ip_net for networks and interfaces, self._add_ip_addr for single
-                    addresses.
-                match_group:
-                    The match group to select from re.Match.
-                match_transform:
-                    The function to be used to transform the IP text from the re.Match result.
-                    Defaults to an identity function that returns the identical string passed to it.
-
-            Returns:
-                The end index of the string that was matched, or None if there was no match or
-                there was a failure of the ipaddress library to parse the extracted IP string.
-                """
-            nonlocal line
-            m = re.search(pattern, line)
-            if m:
-                #
-                # Extract the match
-                ip = m.group(match_group)
-                #
-                # Run the user-supplied transform on the extracted object (used to add a / between
-                # address and netmask from IOS configurations, so IPv4Network knows about netmask)
-                ip = match_transform(ip)
-                logging.debug('try_search_and_parse: Found re match %s', ip)
-                #
-                # If the conversion to an ipaddress object is successful
-                if result := convert_fn(ip):
-                    logging.debug('try_search_and_parse: %s converted to %s', ip, result)
-                    #
-                    # Shrink the line to the end of the matched term
-                    end = m.end(match_group)
-                    logging.debug('try_search_and_parse: New end is %s: "%s" || "%s"',
-                                  end, line[:end], line[end:])
-                    line = line[end:]
-                    return result
-                logging.debug('try_search_and_parse: failed to parse %s', ip)
-            return None
         #
-        # SNMP OIDs often look like IPs. If OID, exit.
-        if re.search(self._ip_patterns['snmp_oid'], self.line):
+        # Every IP form contains a '.' or ':'. Most lines in a config have neither, so skip the
+        # regex machinery for them. Comments are still scanned, as they may mention IPs.
+        if '.' not in line and ':' not in line:
             return
         #
-        # Search in our copy of self.line
-        while len(line) > 0:
-            #
-            # IPv6 network case
-            if net_addr_t := try_search_and_parse(self._ip_patterns['ipv6_net'],
-                                                  self._parse_ip_net):
-                yield net_addr_t
-            #
-            # IPv6 address case, with no slash
-            elif net_addr_t := try_search_and_parse(self._ip_patterns['ipv6_addr'],
-                                                    self._parse_ip_addr):
-                yield net_addr_t
-            #
-            # IPv4 network case, with slash
-            elif net_addr_t := try_search_and_parse(self._ip_patterns['ipv4_cidr'],
-                                                    self._parse_ip_net):
-                yield net_addr_t
-            #
-            # IPv4 network case, with address and netmask separated by a space
-            elif net_addr_t := try_search_and_parse(self._ip_patterns['ipv4_addr_netmask'],
-                                           self._parse_ip_net,
-                                           match_transform=lambda x: '/'.join(x.split())):
-                yield net_addr_t
-            #
-            # IPv4 address case
-            elif net_addr_t := try_search_and_parse(self._ip_patterns['ipv4_addr'],
-                                                    self._parse_ip_addr):
-                yield net_addr_t
+        # SNMP OIDs often look like IPs. If OID, exit. An OID match needs at least four dots, so
+        # count them in C before running the pattern.
+        if line.count('.') >= 4 and self._snmp_oid_search(line):
+            return
+        #
+        # Search self.line from a position cursor rather than slicing off what has been scanned
+        pos = 0
+        while m := self._ip_search(line, pos):
+            kind = m.lastgroup
+            ip, end = m.group(kind), m.end(kind)
+            logging.debug('_gen_ip_addrs_nets: Found %s re match %s', kind, ip)
+            result = self._ip_parsers[kind](ip)
             #
-            # Otherwise no matches were found
+            # If the ipaddress library rejects the matched text, fall back to the lower-priority
+            # patterns at the same position, e.g. "192.0.2.1 192.0.2.2" is not an address and
+            # netmask, but does begin with an address.
+            for fallback_kind in self._ip_kinds[self._ip_kinds.index(kind) + 1:]:
+                if result is not None:
+                    break
+                if fm := self._ip_patterns[fallback_kind].match(line, m.start()):
+                    ip, end = fm.group(1), fm.end(1)
+                    logging.debug('_gen_ip_addrs_nets: Found %s re match %s', fallback_kind, ip)
+                    result = self._ip_parsers[fallback_kind](ip)
+            if result is not None:
+                logging.debug('_gen_ip_addrs_nets: %s converted to %s', ip, result)
+                yield result
             else:
-                return
+                logging.debug('_gen_ip_addrs_nets: failed to parse %s', ip)
+                #
+                # Skip only the first term of the match, as the rest may hold a valid IP
+                end = m.start() + len(m.group().split()[0])
+            #
+            # Resume the search at the end of the matched term
+            pos = end
 
     @staticmethod
     def _parse_ip_addr(ip: str) -> Optional[IPAddrAndNet]:
-        """Attempt to parse what looks like an IP address."""
+        """Attempt to parse what looks like an IP address.
+
+        The text is converted to packed bytes with socket.inet_pton(), several times faster than
+        ipaddress parsing the string itself, and the bytes are passed to the ipaddress class of the
+        matching version.
+        """
+        ipa = DocumentLine._ipa or DocumentLine._import_ip_modules()
+        inet_pton = DocumentLine._socket.inet_pton
         try:
-            ip_addr = ipa.ip_address(ip)
-        except ValueError:
+            if ':' in ip:
+                return ipa.IPv6Address(inet_pton(DocumentLine._socket.AF_INET6, ip)), None
+            return ipa.IPv4Address(inet_pton(DocumentLine._socket.AF_INET, ip)), None
+        except OSError:
             return None
-        return ip_addr, None
 
     @staticmethod
     def _parse_ip_net(ip: str) -> Optional[IPAddrAndNet]:
-        """Attempt to parse what looks like an IP network. Include both address and network."""
-        net_fail = False
+        """Attempt to parse what looks like an IP network. Include both address and network.
+
+        A single ip_interface() parse covers both cases: for a network statement such as
+        '192.0.2.0/24', the interface address is the network address, and for an interface such as
+        '192.0.2.1/24', it is the host address.
+        """
+        ipa = DocumentLine._ipa or DocumentLine._import_ip_modules()
         try:
-            ip_net = ipa.ip_network(ip, strict=True)
-            ip_addr = ip_net.network_address
-        except (ipa.AddressValueError, ipa.NetmaskValueError, ValueError):
-            net_fail = True
-        if net_fail:
-            try:
-                ip_intf = ipa.ip_interface(ip)
-                ip_net = ip_intf.network
-                ip_addr = ip_intf.ip
-            except (ipa.AddressValueError, ipa.NetmaskValueError, ValueError):
-                return None
-        return ip_addr, ip_net
+            ip_intf = ipa.ip_interface(ip)
+        except ValueError:
+            return None
+        return ip_intf.ip, ip_intf.network
+
+    @staticmethod
+    def _parse_ip_addr_netmask(ip: str) -> Optional[IPAddrAndNet]:
+        """Attempt to parse what looks like an IP address and netmask separated by a space."""
+        return DocumentLine._parse_ip_net('/'.join(ip.split()))
+
+    _ip_parsers = {
+        'ipv6_net': _parse_ip_net,
+        'ipv6_addr': _parse_ip_addr,
+        'ipv4_cidr': _parse_ip_net,
+        'ipv4_addr_netmask': _parse_ip_addr_netmask,
+        'ipv4_addr': _parse_ip_addr,
+    }
+    """Maps each IP pattern name in _ip_kinds to the function that converts its matched text."""
+
+    #
+    # Frequently used str methods are delegated explicitly, sparing the __getattr__ fallback on
+    # the hot text-handling path.
+    def startswith(self, *args, **kwargs):
+        """Equivalent to self.line.startswith()."""
+        return self._line.startswith(*args, **kwargs)
+
+    def endswith(self, *args, **kwargs):
+        """Equivalent to self.line.endswith()."""
+        return self._line.endswith(*args, **kwargs)
+
+    def split(self, *args, **kwargs):
+        """Equivalent to self.line.split()."""
+        return self._line.split(*args, **kwargs)
+
+    def strip(self, *args, **kwargs):
+        """Equivalent to self.line.strip()."""
+        return self._line.strip(*args, **kwargs)
+
+    def lstrip(self, *args, **kwargs):
+        """Equivalent to self.line.lstrip()."""
+        return self._line.lstrip(*args, **kwargs)
+
+    def rstrip(self, *args, **kwargs):
+        """Equivalent to self.line.rstrip()."""
+        return self._line.rstrip(*args, **kwargs)
+
+    def find(self, *args, **kwargs):
+        """Equivalent to self.line.find()."""
+        return self._line.find(*args, **kwargs)
+
+    def replace(self, *args, **kwargs):
+        """Equivalent to self.line.replace()."""
+        return self._line.replace(*args, **kwargs)
+
+    def lower(self, *args, **kwargs):
+        """Equivalent to self.line.lower()."""
+        return self._line.lower(*args, **kwargs)
+
+    def upper(self, *args, **kwargs):
+        """Equivalent to self.line.upper()."""
+        return self._line.upper(*args, **kwargs)
 
     def __contains__(self, item):
         return self.line.__contains__(item)
@@ -424,11 +652,15 @@ class DocumentLine:
 
     def __eq__(self, other):
         if type(other) is type(self):
-            return other.line_num == self._line_num and other.line == self._line
+            #
+            # Compare the cached hashes and line numbers before the text. Interned lines with equal
+            # text are usually the same object, so the identity test avoids a string compare.
+            return self._hash == other._hash and self._line_num == other._line_num and \
+                (self._line is other._line or self._line == other._line)
         return self._line == other
 
     def __hash__(self):
-        return hash((self._line_num, self._line))
+        return self._hash
 
     def __str__(self):
         return self._line
@@ -447,5 +679,13 @@ class DocumentLine:
 
         Returns:
             Attribute or method from self.line that was called
+
+        Raises:
+            AttributeError: if item is a private or dunder name, or is not an attribute of str.
         """
+        #
+        # Private and dunder names are never delegated. Probes from hasattr(), copy, and pickle then
+        # fail fast here, and an unset slot cannot recurse back into this method through self._line.
+        if item.startswith('_'):
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{item}'")
         return getattr(self._line, item)
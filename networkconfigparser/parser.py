@@ -1,10 +1,18 @@
 """Parses the sections of a config document."""
 from collections import namedtuple
+from itertools import chain, islice
 import logging
 import re
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
 from networkconfigparser.documentline import DocumentLine
 
+#
+# Compiled once here rather than looked up in the re module cache on every line. The set pattern
+# is only run on lines that contain '-set '.
+_cisco_banner_match = re.compile(r'^banner \S+ (\S+)$').match
+_arista_banner_match = re.compile(r'^banner \S+$').match
+_set_match = re.compile(r'\w+-set ').match
+
 
 def num_leading_spaces(s: str) -> int:
     """Counts the number of leading spaces.
@@ -15,14 +23,24 @@ def num_leading_spaces(s: str) -> int:
     Returns:
         An int of the number of counted leading spaces.
     """
-    i = 0
-    while s.startswith(" "):
-        i += 1
-        s = s[1:]
-    return i
+    return len(s) - len(s.lstrip(' '))
+
+
+def _scan_lines(doc_lines: Iterable[str]) -> Iterator[Tuple[int, str, int]]:
+    """Measures each line of a document once, ahead of the tree-building loop.
+
+    Args:
+        doc_lines: An iterable of lines from the document, one line per entry.
+
+    Returns:
+        An iterator of (line number, rstripped line, number of leading spaces) tuples.
+    """
+    for lc, line in enumerate(doc_lines, 1):
+        line = line.rstrip()
+        yield lc, line, len(line) - len(line.lstrip(' '))
 
 
-def parse_autodetect(doc_lines: List[str]) -> List[DocumentLine]:
+def parse_autodetect(doc_lines: Iterable[str]) -> List[DocumentLine]:
     """Parse a document, automatically detecting what type of parser to use.
 
     This method, at present, searches for brace characters '{' and '}' to detect whether
@@ -30,8 +48,11 @@ def parse_autodetect(doc_lines: List[str]) -> List[DocumentLine]:
     closing braces at the end, parse_braced() is used. Otherwise, the document is assumed to be
     structured with leading spaces and parse_leading_spaces() is used.
 
+    Only the first lines of the document are sampled, so doc_lines may be any iterable of lines,
+    such as an open file, and is read only once.
+
     Args:
-        doc_lines: A list of lines from the document, one line per list entry.
+        doc_lines: An iterable of lines from the document, one line per entry.
 
     Returns:
         A list of DocumentLines as parsed by either parse_braced() or parse_leading_spaces().
@@ -45,28 +66,37 @@ def parse_autodetect(doc_lines: List[str]) -> List[DocumentLine]:
         '}': 0,
         # ';': 0,  # This code once checked for semicolons but was removed to handle UBNT configs
     }
+    #
+    # Take the sample from the front of the document and put it back in front of the remaining
+    # lines for the chosen parser.
+    doc_iter = iter(doc_lines)
+    sample = list(islice(doc_iter, maximum_lines))
+    doc_lines = chain(sample, doc_iter)
     lc = 0
-    for line in doc_lines[:maximum_lines]:
+    for line in sample:
         #
         # Skip comments
-        if line.startswith('#') or line.startswith('!'):
+        if line[:1] in ('#', '!'):
             continue
         #
         # Increment line counter
         lc += 1
         #
-        # Look for line-ending characters
-        for k in braced_line_end_chars:
-            if line.rstrip().endswith(k):
-                braced_line_end_chars[k] += 1
+        # Look for line-ending characters. Only the counter that changed needs to be tested against
+        # the minimum match.
+        last_char = line.rstrip()[-1:]
+        if last_char not in braced_line_end_chars:
+            continue
+        braced_line_end_chars[last_char] += 1
         #
         # If we have hit the minimum match for all line ending chars, process as a braced config
-        if all(i > minimum_match for i in braced_line_end_chars.values()):
+        if braced_line_end_chars[last_char] > minimum_match and \
+                all(i > minimum_match for i in braced_line_end_chars.values()):
             return parse_braced(doc_lines)
     return parse_leading_spaces(doc_lines)
 
 
-def parse_braced(doc_lines: List[str]) -> List[DocumentLine]:
+def parse_braced(doc_lines: Iterable[str]) -> List[DocumentLine]:
     """Parse a document structured with braces and semicolons, similar to C code.
 
     This parser should be used for JunOS-like configurations, including but not limited to JunOS
@@ -74,40 +104,58 @@ def parse_braced(doc_lines: List[str]) -> List[DocumentLine]:
     parse_autodetect().
 
     Args:
-        doc_lines: A list of lines from the document, one line per list entry.
+        doc_lines: An iterable of lines from the document, one line per entry.
 
     Returns:
         A list of DocumentLine objects.
     """
+    #
+    # Checked once per document. Debug calls whose arguments do work, like lstrip() copies, are
+    # skipped while debug logging is off. Calls that only pass objects to be formatted lazily are
+    # left unguarded.
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
     dn_list = []
     dn_stack: List[DocumentLine] = []
-    for lc, line in zip(range(1, len(doc_lines) + 1), doc_lines):
+    #
+    # Bound add_child() method of the section at the top of dn_stack, updated only when the stack
+    # changes rather than looked up for every line.
+    add_to_section = None
+    for lc, line in enumerate(doc_lines, 1):
         #
         # Remove whitespace and LF at the end of the line
         line = line.rstrip()
         #
         # Create a new DocumentLine object and add to the children list of the parent.
         current_dn = DocumentLine(lc, line)
-        if len(dn_stack) > 0:
-            current_dn.parent = dn_stack[-1]
-            dn_stack[-1].children.append(current_dn)
+        if add_to_section is not None:
+            add_to_section(current_dn)
         dn_list.append(current_dn)
         #
+        # Lines ending with a brace open or close a section, unless they are comments. The comment
+        # test is only made for those lines.
+        last_char = line[-1:]
+        if last_char not in ('{', '}') or line.lstrip().startswith('#'):
+            continue
+        #
         # If line ends with an opening brace, add this item to the stack
-        if line.endswith('{') and not line.lstrip().startswith('#'):
-            logging.debug('parse_braced: section "%s" opening', current_dn.lstrip())
+        if last_char == '{':
+            if debug:
+                logging.debug('parse_braced: section "%s" opening', current_dn.lstrip())
             dn_stack.append(current_dn)
+            add_to_section = current_dn.add_child
             logging.debug('parse_braced: dn_stack: %s', dn_stack)
-        #
-        # If line ends with a closing brace, pop the current item off the stack
-        if line.endswith('}') and not line.lstrip().startswith('#'):
-            logging.debug('parse_braced: section "%s" closing', dn_stack[-1].lstrip())
+        else:
+            #
+            # If line ends with a closing brace, pop the current item off the stack
+            if debug:
+                logging.debug('parse_braced: section "%s" closing', dn_stack[-1].lstrip())
             dn_stack.pop()
+            add_to_section = dn_stack[-1].add_child if dn_stack else None
             logging.debug('parse_braced: dn_stack: %s', dn_stack)
     return dn_list
 
 
-def parse_leading_spaces(doc_lines: List[str]) -> List[DocumentLine]:
+def parse_leading_spaces(doc_lines: Iterable[str]) -> List[DocumentLine]:
     """Parse a document structured with leading spaces.
 
     This parser should be used for Cisco-type configurations, including but not limited to Cisco
@@ -115,7 +163,7 @@ def parse_leading_spaces(doc_lines: List[str]) -> List[DocumentLine]:
     parse_autodetect().
 
     Args:
-        doc_lines: A list of lines from the document, one line per list entry.
+        doc_lines: An iterable of lines from the document, one line per entry.
 
     Returns:
         A list of DocumentLine objects.
@@ -139,18 +187,15 @@ def parse_leading_spaces(doc_lines: List[str]) -> List[DocumentLine]:
         """Return True if exceptional circumstances are in effect that should cause the parser not
         to apply familial logic based on leading spaces."""
         return banner_delimiter is not None or in_policy_set_section
-    for lc, line in zip(range(1, len(doc_lines) + 1), doc_lines):
-        #
-        # Remove whitespace and LF at the end of the line
-        line = line.rstrip()
-        #
-        # If the current space level is less than the number of spaces on this new line, this is a
-        # new section and the last line should be placed on the dn_stack.
-        new_space_level = num_leading_spaces(line)
+    #
+    # Lines arrive rstripped, along with their number of leading spaces. If the current space level
+    # is less than the number of spaces on a new line, this is a new section and the last line
+    # should be placed on the dn_stack.
+    for lc, line, new_space_level in _scan_lines(doc_lines):
         #
         # If in_policy_set_section is set, and the line starts with something other than a space or
         # an end-policy / end-set marker, log a warning and pop the last member off the stack.
-        if in_policy_set_section and not (line.startswith(' ') or line.startswith('end-')):
+        if in_policy_set_section and not (new_space_level > 0 or line.startswith('end-')):
             logging.warning('parse_leading_spaces: no end-set or end-policy encountered at line %s '
                             'within section %s',
                             lc,
@@ -160,36 +205,39 @@ def parse_leading_spaces(doc_lines: List[str]) -> List[DocumentLine]:
         #
         # If the current space level is less than the new space level, add the previous line to the
         # stack.
-        if not ignore_spaces() and current_space_level() < new_space_level and \
+        if not ignore_spaces() and (space_level := current_space_level()) < new_space_level and \
                 current_dn is not None:
             logging.debug('parse_leading_spaces: space_level %s -> %s: incr',
-                          current_space_level(), new_space_level)
+                          space_level, new_space_level)
             dn_stack.append(StackMember(new_space_level, current_dn))
             logging.debug('parse_leading_spaces: dn_stack: %s', dn_stack)
         #
         # If the current space level is greater than the number of spaces on this new line, this is
         # an end to the current section and the sections should be popped to match.
-        if not ignore_spaces() and current_space_level() > new_space_level:
+        if not ignore_spaces() and (space_level := current_space_level()) > new_space_level:
             logging.debug('parse_leading_spaces: space_level %s -> %s: decr',
-                          current_space_level(), new_space_level)
-            while current_space_level() > new_space_level:
-                dn_stack.pop()
+                          space_level, new_space_level)
+            #
+            # Find how many stack members to keep, then truncate the stack in place.
+            keep = len(dn_stack)
+            while keep > 0 and dn_stack[keep - 1].child_space_level > new_space_level:
+                keep -= 1
+            del dn_stack[keep:]
             logging.debug('parse_leading_spaces: dn_stack: %s', dn_stack)
         #
         # Create a new DocumentLine object and add to the children list of the parent.
         current_dn = DocumentLine(lc, line)
-        if len(dn_stack) > 0:
-            current_dn.parent = dn_stack[-1].ancestor
-            dn_stack[-1].ancestor.children.append(current_dn)
+        if dn_stack:
+            dn_stack[-1].ancestor.add_child(current_dn)
         dn_list.append(current_dn)
         #
         # Exceptional Situations
         #
         # Deal with banners.
         if line.startswith('banner '):
-            if m := re.match(r'^banner \S+ (\S+)$', line): # Cisco style
+            if m := _cisco_banner_match(line): # Cisco style
                 banner_delimiter = m.group(1)
-            elif re.match(r'^banner \S+$', line.strip()):  # Arista style
+            elif _arista_banner_match(line.strip()):  # Arista style
                 banner_delimiter = 'EOF'
             dn_stack.append(StackMember(1, current_dn))
             logging.debug('parse_leading_spaces: found banner start, delimiter="%s"',
@@ -204,14 +252,14 @@ def parse_leading_spaces(doc_lines: List[str]) -> List[DocumentLine]:
             logging.debug('parse_leading_spaces: dn_stack: %s', dn_stack)
         #
         # Deal with route policies and sets.
-        if line.startswith('route-policy ') or re.match(r'\w+-set ', line):
+        if line.startswith('route-policy ') or ('-set ' in line and _set_match(line)):
             dn_stack.append(StackMember(1, current_dn))
             in_policy_set_section = True
-            logging.debug('parse_leading_spaces: found IOSXR %s start', line.split()[0])
+            logging.debug('parse_leading_spaces: found IOSXR section start: %s', line)
             logging.debug('parse_leading_spaces: dn_stack: %s', dn_stack)
         if in_policy_set_section and line.startswith('end-'):
-            logging.debug('parse_leading_spaces: found IOSXR %s end',
-                          dn_stack[-1].ancestor.split()[0])
+            logging.debug('parse_leading_spaces: found IOSXR section end: %s',
+                          dn_stack[-1].ancestor)
             dn_stack.pop()
             in_policy_set_section = False
             logging.debug('parse_leading_spaces: dn_stack: %s', dn_stack)
@@ -225,8 +273,9 @@ def parse_from_file(document_filename: str) -> List[DocumentLine]:
     .. code-block:: python
 
         with open(document_filename) as fh:
-            text_lines = fh.readlines()
-        return parse_from_str_list(text_lines)
+            return parse_from_str_list(fh)
+
+    The file is read line by line as it is parsed, rather than read into a list first.
 
     Args:
         document_filename: Full path of the file to open and read from
@@ -235,10 +284,9 @@ def parse_from_file(document_filename: str) -> List[DocumentLine]:
         A list of DocumentLine objects.
     """
     with open(document_filename, encoding='UTF-8') as fh:
-        text_lines = fh.readlines()
-    return parse_from_str_list(text_lines)
+        return parse_from_str_list(fh)
 
-def parse_from_str_list(text_lines: List[str]) -> List[DocumentLine]:
+def parse_from_str_list(text_lines: Iterable[str]) -> List[DocumentLine]:
     """Parses a document stored in a list of text.
 
     This passes the lines of text to parse_autodetect(), an internal function that determines
@@ -248,7 +296,7 @@ def parse_from_str_list(text_lines: List[str]) -> List[DocumentLine]:
     During processing, all lines are rstrip()'ed, so no trailing spaces are preserved.
 
     Args:
-        text_lines: List of text to be parsed.
+        text_lines: List, or any other iterable, of text to be parsed.
 
     Returns:
         A list of DocumentLine objects.
@@ -1,5 +1,6 @@
 """A set of functions to assist with searching in a list of DocumentLine objects."""
-from operator import attrgetter
+from functools import lru_cache
+from itertools import chain
 import re
 from typing import List, Callable, Iterable, Any
 from networkconfigparser.documentline import DocumentLine
@@ -157,17 +158,22 @@ def find_lines(doc_lines: List[DocumentLine] | None,
         if convert_match is not identity:
             raise ValueError('find_lines: both group and convert_match are specified - use one or '
                              'the other')
+        ft_search = _compile_regex(ft, regex_flags).search
         def regex_group_match(x: DocumentLine) -> bool:
-            return x.re_search(ft, regex_flags).group(regex_group)
+            return ft_search(x.line).group(regex_group)
         convert_match = regex_group_match
     #
     # Convert search_term to a callable or to a list of callables.
     search_spec = convert_search_spec_to_cb(search_spec, regex_flags)
     #
     # Gather passthrough options.
-    passthru_names = ['convert_', 'suppress_', 'include_', 'flatten_']
-    passthru_opts = {k: v for k, v in locals().items() if any(k.startswith(opt) for opt in
-                                                              passthru_names)}
+    passthru_opts = {'convert_match': convert_match,
+                     'convert_family': convert_family,
+                     'flatten_family': flatten_family,
+                     'suppress_common_ancestors': suppress_common_ancestors,
+                     'include_ancestors': include_ancestors,
+                     'include_children': include_children,
+                     'include_all_descendants': include_all_descendants}
     #
     # Iterate over search_spec.
     if is_iterable_search_term(search_spec):
@@ -177,15 +183,8 @@ def find_lines(doc_lines: List[DocumentLine] | None,
         for search_fn in search_spec[:-1]:
             #
             # Narrow doc_lines by matching successive descendant lines of the last search.
-            # Omit the matched line itself ("include_self=False"), get only the children of the
-            # match.
-            doc_lines = find_lines_with_cb(doc_lines,
-                                           search_fn,
-                                           suppress_common_ancestors=False,
-                                           include_ancestors=False,
-                                           include_self=False,
-                                           include_children=True,
-                                           include_all_descendants=recurse_search)
+            # Omit the matched line itself, get only the children of the match.
+            doc_lines = _descend_matches(doc_lines, search_fn, recurse_search)
     #
     # Process the final search_spec if it was iterable, or the search_spec itself if it was a single
     # callable.
@@ -194,6 +193,43 @@ def find_lines(doc_lines: List[DocumentLine] | None,
         return None
     return result
 
+def _descend_matches(doc_lines: List[DocumentLine],
+                     search_fn: Callable[[DocumentLine], bool],
+                     recurse: bool) -> List[DocumentLine]:
+    """Returns the children, or all descendants if recurse is True, of lines matching search_fn.
+
+    Used by find_lines() to narrow the lines searched for each successive term. Each line is
+    returned once, in the order it was read from the document, even where matches are nested in
+    each other.
+
+    Args:
+        doc_lines:
+            A list of DocumentLines to search.
+        search_fn:
+            A function that takes a DocumentLine as input and returns a bool indicating a match.
+        recurse:
+            If True, returns all descendants of the matches. If False, returns only their immediate
+            children.
+
+    Returns:
+        A list of DocumentLines descended from the matches.
+    """
+    result = []
+    seen = set()
+    for line in doc_lines:
+        #
+        # With recurse set, a line already collected lies in the subtree of an earlier match,
+        # and its own descendants were collected along with it. Skip it without searching it.
+        if recurse and id(line) in seen:
+            continue
+        if not search_fn(line):
+            continue
+        for descendant in line.all_descendants if recurse else line.children:
+            if id(descendant) not in seen:
+                seen.add(id(descendant))
+                result.append(descendant)
+    return result
+
 def find_lines_with_cb(doc_lines: List[DocumentLine],
                        search_fn: Callable[[DocumentLine], bool],
                        /,
@@ -257,9 +293,10 @@ def find_lines_with_cb(doc_lines: List[DocumentLine],
         include_children = True
     #
     # Gather include options for DocumentLine.family()
-    passthru_names = ['include_']
-    passthru_opts = {k: v for k, v in locals().items() if any(k.startswith(opt) for opt in
-                                                              passthru_names)}
+    passthru_opts = {'include_ancestors': include_ancestors,
+                     'include_self': include_self,
+                     'include_children': include_children,
+                     'include_all_descendants': include_all_descendants}
     #
     # If suppress_common_ancestors is True, get a closure function to help suppress common lines.
     if suppress_common_ancestors:
@@ -267,21 +304,29 @@ def find_lines_with_cb(doc_lines: List[DocumentLine],
     else:
         s = identity
     #
-    # Perform the comparison.
-    matches = [i for i in doc_lines if search_fn(i)]
-    #
     # If all include_ options to DocumentLine.family() are False, no family inclusions are
-    # specified. Return the matches, converting the result.
+    # specified. Perform the comparison and return the matches, converting the result.
     if not any(passthru_opts.values()):
+        matches = [i for i in doc_lines if search_fn(i)]
         if flatten_family:
             return [convert_match(i) for i in matches]
         return [[convert_match(i)] for i in matches]
     #
     # Process family lines.
     #
+    # Without conversions, each match flows from the comparison straight into family() in a single
+    # pass, and the families are concatenated as they are, in C.
+    if flatten_family and convert_match is identity and convert_family is identity:
+        return list(chain.from_iterable(s(i.family(**passthru_opts))
+                                        for i in doc_lines if search_fn(i)))
+    #
+    # Perform the comparison.
+    matches = [i for i in doc_lines if search_fn(i)]
+    match_ids = {id(i) for i in matches}
+    #
     # Define a closure to apply conversions.
     def convert_line(o: DocumentLine) -> Any:
-        if o in matches:
+        if id(o) in match_ids:
             return convert_match(o)
         return convert_family(o)
     #
@@ -304,7 +349,20 @@ def re_search_cb(regex: str | re.Pattern, flags: int | re.RegexFlag = 0) \
         A callable that takes a DocumentLine as an argument and returns the result of re.search on
         the object's line
     """
-    return lambda o: o.re_search(regex, flags)
+    search = _compile_regex(regex, flags).search
+    return lambda o: search(o.line)
+
+@lru_cache(maxsize=4096)
+def _compile_regex(regex: str | re.Pattern, flags: int | re.RegexFlag = 0) -> re.Pattern:
+    """Compiles a regex str once, so callbacks built from it skip the re module's pattern cache on
+    every line. re.Pattern objects are returned as-is and flags are ignored, as in
+    DocumentLine.re_search().
+
+    Compiled patterns are kept in an LRU cache larger than the re module's own, so repeated
+    searches with the same regexes, as in audit scripts, do not recompile them."""
+    if isinstance(regex, re.Pattern):
+        return regex
+    return re.compile(regex, flags)
 
 def parent_child_cb(parent_spec: str | re.Pattern | Callable[[DocumentLine], bool],
                     child_spec: str | re.Pattern | Callable[[DocumentLine], bool],
@@ -374,21 +432,22 @@ def parent_child_cb(parent_spec: str | re.Pattern | Callable[[DocumentLine], boo
     if not is_regex(child_spec):
         raise ValueError(f'parent_child_cb: {type(child_spec)} is not a valid regex')
     #
-    # If recurse is set, we look at all_descendants of the object
-    if recurse:
-        child_getter = attrgetter('all_descendants')
-    #
-    # Otherwise, we look at only the immediate children
-    else:
-        child_getter = attrgetter('children')
+    # Compile both regexes once rather than on each call of search_fn
+    parent_search = _compile_regex(parent_spec, regex_flags).search
+    child_search = _compile_regex(child_spec, regex_flags).search
     #
     # Search function to pass to find_lines()
     def search_fn(o: DocumentLine) -> bool:
-        parent_match = o.re_search(parent_spec, regex_flags) is not None
-        child_match = any(c.re_search(child_spec, regex_flags) is not None for c in child_getter(o))
-        if negative_child_match:
-            child_match = not child_match
-        return parent_match and child_match
+        #
+        # Most lines fail the parent match, so the children are only searched for those that pass.
+        if parent_search(o.line) is None:
+            return False
+        #
+        # If recurse is set, we look at all descendants of the object, walked lazily so any() can
+        # stop at the first match. Otherwise, we look at only the immediate children.
+        children = o.iter_descendants() if recurse else o.children
+        child_match = any(child_search(c.line) is not None for c in children)
+        return child_match != negative_child_match
     return search_fn
 
 def common_line_suppressor() -> Callable[[List[DocumentLine]], List[DocumentLine]]:
@@ -439,7 +498,10 @@ def common_line_suppressor() -> Callable[[List[DocumentLine]], List[DocumentLine
     Returns:
         A function to be used in a list comprehension that suppresses adjacent common lines.
     """
-    previous_lines = []
+    #
+    # ids of the previous family's lines, so each membership test is a set lookup rather than a
+    # scan of the previous list calling DocumentLine.__eq__().
+    previous_ids = set()
     def suppress_common_lines(family_lines: List[DocumentLine]) -> List[DocumentLine]:
         """Suppresses adjacent common lines.
 
@@ -450,9 +512,9 @@ def common_line_suppressor() -> Callable[[List[DocumentLine]], List[DocumentLine
         Returns:
             Filtered list with common lines removed.
             """
-        nonlocal previous_lines
-        filtered_lines = [i for i in family_lines if i not in previous_lines]
-        previous_lines = family_lines
+        nonlocal previous_ids
+        filtered_lines = [i for i in family_lines if id(i) not in previous_ids]
+        previous_ids = {id(i) for i in family_lines}
         return filtered_lines
     return suppress_common_lines
 
@@ -466,10 +528,10 @@ def is_iterable_search_term(obj: Any) -> bool:
     Returns:
         True if iterable, False if not
     """
-    return isiterable(obj) and not is_regex(obj)
+    return not is_regex(obj) and isiterable(obj)
 
 def isiterable(obj: Any) -> bool:
-    """Returns True if an object is iterable and is not a string or re.Pattern.
+    """Returns True if an object is iterable.
 
     Args:
         obj:
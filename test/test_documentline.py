@@ -1,4 +1,5 @@
 """Testing for DocumentLine object."""
+import copy
 import ipaddress as ipa
 import re
 import unittest
@@ -121,6 +122,18 @@ class TestDocumentLine(unittest.TestCase):
         a, n = ips[1]
         assert a == ipa.IPv4Address('192.0.2.233')
         assert n is None
+        #
+        # Two addresses that look like an address and netmask are parsed as two addresses
+        ips = list(DocumentLine(1, 'ntp server 192.0.2.1 192.0.2.2')._gen_ip_addrs_nets())
+        assert ips == [(ipa.IPv4Address('192.0.2.1'), None), (ipa.IPv4Address('192.0.2.2'), None)]
+        #
+        # Terms that fail to parse do not hide IPs that follow them
+        ips = list(DocumentLine(1, 'clock 12:30:00 998.0.2.1 192.0.2.0/24')._gen_ip_addrs_nets())
+        assert ips == [(ipa.IPv4Address('192.0.2.0'), ipa.IPv4Network('192.0.2.0/24'))]
+        #
+        # Digits adjacent to a dotted quad are part of a longer term, not an IP
+        assert not list(DocumentLine(1, 'version 1234.5.6.7')._gen_ip_addrs_nets())
+        assert not list(DocumentLine(1, 'version 4.5.6.7890')._gen_ip_addrs_nets())
 
     def test_ipv4_has_ip(self):
         """Test IPv4 address / network matching"""
@@ -166,6 +179,15 @@ class TestDocumentLine(unittest.TestCase):
         assert dl.has_ip(ipa.IPv4Network('0.0.0.0/0'))
         assert not dl.has_ip(ipa.IPv4Network('198.51.100.0/24'))
         assert not dl.has_ip(ipa.IPv6Network('2001:db8:690:f00b::/64'))
+        #
+        # Subclasses of the ipaddress classes are matched as their base class
+        class Addr(ipa.IPv4Address):
+            """IPv4Address subclass."""
+        class Intf(ipa.IPv4Interface):
+            """IPv4Interface subclass, which also subclasses IPv4Address."""
+        assert dl.has_ip(Addr('192.0.2.233'))
+        assert dl.has_ip(Intf('0.0.0.0/0'))
+        assert not dl.has_ip(Intf('192.0.2.233/24'))
 
     def test_identity_equality(self):
         """Test equality, identity, and hashing functions"""
@@ -191,8 +213,13 @@ class TestDocumentLine(unittest.TestCase):
         assert '|'.join(dl.split()) == test_line.lstrip().replace(' ', '|')
         assert str(dl) == test_line
         assert dl.lstrip() == test_line[1:]
+        assert dl.lower() == test_line.lower()
+        assert dl.upper() == test_line.upper()
         assert 'foobr' not in dl
         assert '203.0.113.0' in dl
+        assert dl.isdigit() is False
+        assert not hasattr(dl, '_foobar')
+        assert copy.copy(dl) == dl
 
     def test_gen(self):
         """Test computation of the 'gen', 'parent', 'children', and 'all_descendants' attributes"""
@@ -219,12 +246,72 @@ class TestDocumentLine(unittest.TestCase):
         assert dl_list[3].ancestors == dl_list[0:1]
         assert dl_list[0].children == [dl_list[1], dl_list[3]]
         assert dl_list[1].children == [dl_list[2]]
-        assert dl_list[2].children == []
-        assert dl_list[3].children == []
+        assert dl_list[2].children == ()
+        assert dl_list[3].children == ()
         assert dl_list[0].all_descendants == dl_list[1:4]
         assert dl_list[1].all_descendants == dl_list[2:3]
         assert dl_list[2].all_descendants == []
         assert dl_list[3].all_descendants == []
+        assert list(dl_list[0].iter_descendants()) == dl_list[1:4]
+        assert not list(dl_list[2].iter_descendants())
+
+    def test_lineage_updates(self):
+        """Test that 'gen', 'ancestors', and descendants follow changes to the tree"""
+        dl_list = [DocumentLine(1, 'interface GigabitEthernet0/0/0'),
+                   DocumentLine(2, ' description Gig0/0/0'),
+                   DocumentLine(3, '  description-modifier foobar'),
+                   DocumentLine(4, ' ip address 192.0.2.103 192.0.2.254')]
+        dl_list[0].add_child(dl_list[1])
+        dl_list[1].add_child(dl_list[2])
+        dl_list[0].add_child(dl_list[3])
+        assert dl_list[0].all_descendants == dl_list[1:4]
+        #
+        # add_child() replaces the shared empty tuple with a list and sets the parent
+        new_dl = DocumentLine(5, '   description-modifier-modifier foobaz')
+        dl_list[2].add_child(new_dl)
+        assert dl_list[2].children == [new_dl]
+        assert new_dl.parent is dl_list[2]
+        assert new_dl.gen == 4
+        assert dl_list[3].children == ()
+        #
+        # Descendants reflect children added after an earlier read
+        assert dl_list[0].all_descendants == dl_list[1:3] + [new_dl, dl_list[3]]
+        assert dl_list[2].all_descendants == [new_dl]
+        assert dl_list[1].family() == dl_list[0:3] + [new_dl]
+        #
+        # Setting a parent after children are attached updates the cached generation levels
+        dl_list[0].parent = DocumentLine(0, 'l2vpn')
+        assert dl_list[0].gen == 2
+        assert dl_list[1].gen == 3
+        assert dl_list[2].gen == 4
+        assert dl_list[3].gen == 3
+        assert dl_list[2].ancestors == [dl_list[0].parent] + dl_list[0:2]
+        #
+        # Constructing a line, with or without a parent, leaves cached lineage elsewhere valid
+        epoch = DocumentLine._lineage_epoch  # pylint: disable=protected-access
+        orphan = DocumentLine(6, 'router bgp 65000')
+        assert DocumentLine(7, ' bgp router-id 192.0.2.1', parent=orphan).gen == 2
+        assert DocumentLine._lineage_epoch == epoch  # pylint: disable=protected-access
+
+    def test_lineage_bottom_up(self):
+        """Test lineage of a tree assembled bottom-up, with children assigned directly"""
+        a, b, c = DocumentLine(1, 'a'), DocumentLine(2, ' b'), DocumentLine(3, '  c')
+        c.parent = b
+        assert c.gen == 2
+        b.parent = a
+        a.children = [b]
+        b.children = [c]
+        assert c.gen == 3
+        assert c.ancestors == [a, b]
+        assert a.family() == [a, b, c]
+        #
+        # Descendants reflect children assigned directly after an earlier read
+        z = DocumentLine(4, '   z')
+        assert a.all_descendants == [b, c]
+        z.parent = c
+        c.children = [z]
+        assert a.all_descendants == [b, c, z]
+        assert b.family() == [a, b, c, z]
 
     def test_is_comment(self):
         """Test 'is_comment" attribute"""
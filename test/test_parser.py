@@ -51,6 +51,9 @@ class TestParseSpacedConfig(TestCase):
         assert lo.gen == 1
         assert lo.children == p[1:17]
         assert lo.all_descendants == p[1:17]
+        #
+        # Any iterable of lines can be parsed, not only a list
+        assert parse_autodetect(iter(lines)) == p
 
     def test_section_multilevel(self):
         """Test parsing a multi-level section, ensure parent / child relationships are working"""
@@ -73,6 +73,12 @@ class TestSearchHelpers(TestCase):
                             recurse_search=True)
         assert result == self.doc_lines[2:4] + self.doc_lines[5:7]
         #
+        # case recurse_search is True, search_spec matches nested lines, no duplicate results
+        result = find_lines(self.doc_lines,
+                            ['[lb]', 'domain'],
+                            recurse_search=True)
+        assert result == self.doc_lines[2:4] + self.doc_lines[5:7]
+        #
         # case recurse_search is False, search_spec matches chain
         result = find_lines(self.doc_lines,
                             ['l2vpn', 'group', 'domain'],
@@ -228,6 +234,11 @@ class TestSearchHelpers(TestCase):
         cb = re_search_cb(self.test_str, re.IGNORECASE)
         assert not cb(self.doc_lines[0])
         assert cb(self.doc_lines[1])
+        #
+        # case compiled pattern
+        cb = re_search_cb(re.compile(self.test_str, re.IGNORECASE))
+        assert not cb(self.doc_lines[0])
+        assert cb(self.doc_lines[1])
 
     def test_parent_child_cb(self):
         """Test parent_child_cb() function"""